@@ -1,6 +1,7 @@
 import logging
 import abc
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from astropy.io import fits
@@ -35,14 +36,12 @@ class CalibrationMaker(MultiFrameStage):
         try:
             min_images = settings.CALIBRATION_MIN_FRAMES[self.calibration_type.upper()]
         except KeyError:
-            msg = 'The minimum number of frames required to create a master calibration of type ' \
-                  '{calibration_type} has not been specified in the settings.'
-            logger.error(msg.format(calibration_type=self.calibration_type.upper()))
+            logger.error('The minimum number of frames required to create a master calibration of type '
+                         '%s has not been specified in the settings.', self.calibration_type.upper())
             return []
         if len(images) < min_images:
             # Do nothing
-            msg = 'Number of images less than minimum requirement of {min_images}, not combining'
-            logger.warning(msg.format(min_images=min_images))
+            logger.warning('Number of images less than minimum requirement of %s, not combining', min_images)
             return []
         try:
             image_utils.check_image_homogeneity(images, self.group_by_attributes())
@@ -54,6 +53,10 @@ class CalibrationMaker(MultiFrameStage):
 
 
 class CalibrationStacker(CalibrationMaker):
+    # Size of the block of rows that is sigma clipped at a time. This keeps the stack in cache
+    # rather than building the full (ny, nx, n_images) cube in memory.
+    TILE_SIZE_IN_BYTES = 256 * 1024
+
     def __init__(self, runtime_context):
         super(CalibrationStacker, self).__init__(runtime_context)
 
@@ -62,27 +65,35 @@ class CalibrationStacker(CalibrationMaker):
         # is used to create the filename and select the day directory
         images.sort(key=lambda image: image.dateobs, reverse=True)
 
-        data_stack = np.zeros((images[0].ny, images[0].nx, len(images)), dtype=np.float32)
-        stack_mask = np.zeros((images[0].ny, images[0].nx, len(images)), dtype=np.uint8)
-
         make_calibration_name = file_utils.make_calibration_filename_function(self.calibration_type,
                                                                               self.runtime_context)
 
         master_calibration_filename = make_calibration_name(images[0])
 
-        for i, image in enumerate(images):
-            logger.debug('Stacking Frames', image=image,
-                         extra_tags={'master_calibration': os.path.basename(master_calibration_filename)})
-            data_stack[:, :, i] = image.data[:, :]
-            stack_mask[:, :, i] = image.bpm[:, :]
-
-        stacked_data = stats.sigma_clipped_mean(data_stack, 3.0, axis=2, mask=stack_mask, inplace=True)
-
-        # Memory cleanup
-        del data_stack
-        del stack_mask
-
-        master_bpm = np.array(stacked_data == 0.0, dtype=np.uint8)
+        if logger.isEnabledFor(logging.DEBUG):
+            for image in images:
+                logger.debug('Stacking Frames', image=image,
+                             extra_tags={'master_calibration': os.path.basename(master_calibration_filename)})
+
+        ny, nx, n_images = images[0].ny, images[0].nx, len(images)
+        rows_per_tile = max(1, self.TILE_SIZE_IN_BYTES // (nx * n_images * np.dtype(np.float32).itemsize))
+
+        stacked_data = np.empty((ny, nx), dtype=np.float32)
+        master_bpm = np.empty((ny, nx), dtype=np.uint8)
+        # Keep the samples for each pixel contiguous in memory so the sigma clipping reads them sequentially
+        data_stack = np.empty((rows_per_tile, nx, n_images), dtype=np.float32)
+
+        for y_start in range(0, ny, rows_per_tile):
+            y_end = min(y_start + rows_per_tile, ny)
+            tile = data_stack[:y_end - y_start]
+            for i, image in enumerate(images):
+                # Flag bad pixels with NaNs rather than carrying around a separate mask stack
+                tile[..., i] = np.where(image.bpm[y_start:y_end] > 0, np.nan, image.data[y_start:y_end])
+            stacked_data[y_start:y_end] = stats.nan_sigma_clipped_mean(tile, 3.0, axis=-1,
+                                                                       n_threads=self.runtime_context.n_stack_workers)
+            # Pixels with no good samples are filled with zero. Flag them while the rows are still in cache
+            # instead of scanning the whole master frame again afterwards.
+            np.equal(stacked_data[y_start:y_end], 0.0, out=master_bpm[y_start:y_end], casting='unsafe')
 
         # Save the master dark image with all of the combined images in the header
         master_header = create_master_calibration_header(images[0].header, images)
@@ -127,8 +138,9 @@ class ApplyCalibration(Stage):
             logger.error('Master calibration was not the same format as the input: {0}'.format(e), image=image,
                          extra_tags={'master_calibration': os.path.basename(master_calibration_filename)})
             return None
-        logger.info('Applying master calibration', image=image,
-                    extra_tags={'master_calibration': os.path.basename(master_calibration_filename)})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('Applying master calibration', image=image,
+                        extra_tags={'master_calibration': os.path.basename(master_calibration_filename)})
         return self.apply_master_calibration(image, master_calibration_image)
 
     @abc.abstractmethod
@@ -162,12 +174,12 @@ class CalibrationComparer(ApplyCalibration):
             return image
 
         # We assume the image has already been normalized before this stage is run.
-        bad_pixel_fraction = np.abs(image.data - master_calibration_image.data)
-        # Estimate the noise of the image
-        noise = self.noise_model(image)
-        bad_pixel_fraction /= noise
-        bad_pixel_fraction = bad_pixel_fraction >= self.SIGNAL_TO_NOISE_THRESHOLD
-        bad_pixel_fraction = bad_pixel_fraction.sum() / float(bad_pixel_fraction.size)
+        # Estimate the noise of the image. The noise model returns a new array (or a scalar) so we can
+        # scale it to the rejection threshold in place.
+        threshold = self.noise_model(image)
+        threshold *= self.SIGNAL_TO_NOISE_THRESHOLD
+        n_bad_pixels = _count_deviant_pixels(image.data, master_calibration_image.data, threshold)
+        bad_pixel_fraction = n_bad_pixels / float(image.data.size)
         frame_is_bad = bad_pixel_fraction > self.ACCEPTABLE_PIXEL_FRACTION
 
         qc_results = {"master_comparison.fraction": bad_pixel_fraction,
@@ -201,6 +213,28 @@ class CalibrationComparer(ApplyCalibration):
         return np.ones(image.data.size)
 
 
+def _count_deviant_pixels(data, reference_data, threshold, block_size_in_bytes=256 * 1024):
+    """
+    Count the pixels where |data - reference_data| >= threshold, ignoring identical pixels with a zero threshold
+
+    The comparison is done in blocks of rows so that the intermediate difference and boolean
+    arrays stay in cache instead of being allocated for the full frame.
+    """
+    threshold = np.broadcast_to(threshold, data.shape)
+    row_size_in_bytes = data.itemsize * (data.size // max(1, data.shape[0]))
+    rows_per_block = max(1, block_size_in_bytes // max(1, row_size_in_bytes))
+    n_deviant_pixels = 0
+    for start in range(0, data.shape[0], rows_per_block):
+        block = slice(start, start + rows_per_block)
+        # Compare the difference to a threshold in data units rather than dividing every pixel by the noise
+        abs_difference = np.abs(data[block] - reference_data[block])
+        deviant = abs_difference >= threshold[block]
+        # Dividing by a zero noise gave nan (never deviant) for identical pixels, so keep excluding them
+        deviant &= (abs_difference > 0) | (threshold[block] > 0)
+        n_deviant_pixels += np.count_nonzero(deviant)
+    return n_deviant_pixels
+
+
 def create_master_calibration_header(old_header, images):
     header = fits.Header()
     for key in old_header.keys():
@@ -226,25 +260,30 @@ def create_master_calibration_header(old_header, images):
 
 
 def run_master_maker(image_path_list, runtime_context, frame_type):
-    images = [image_utils.read_image(image_path, runtime_context) for image_path in image_path_list]
-    stage_constructor = import_utils.import_attribute(settings.CALIBRATION_STACKER_STAGE[frame_type.upper()])
-    stage_to_run = stage_constructor(runtime_context)
-    images = stage_to_run.run(images)
-    for image in images:
-        image.write(runtime_context)
-
-
-def process_master_maker(instrument, frame_type, min_date, max_date, runtime_context):
+    # Reading and writing the frames is dominated by disk access, funpack and fpack rather than the interpreter,
+    # so overlap the I/O for the different frames
+    with ThreadPoolExecutor(max_workers=runtime_context.n_stack_workers or os.cpu_count()) as executor:
+        images = list(executor.map(lambda image_path: image_utils.read_image(image_path, runtime_context),
+                                   image_path_list))
+        stage_constructor = import_utils.import_attribute(settings.CALIBRATION_STACKER_STAGE[frame_type.upper()])
+        stage_to_run = stage_constructor(runtime_context)
+        images = stage_to_run.run(images)
+        list(executor.map(lambda image: image.write(runtime_context), images))
+
+
+def process_master_maker(instrument, frame_type, min_date, max_date, runtime_context, image_path_list=None):
     extra_tags = {'type': instrument.type, 'site': instrument.site,
                   'enclosure': instrument.enclosure, 'telescope': instrument.telescope,
                   'camera': instrument.camera, 'obstype': frame_type,
                   'min_date': min_date,
                   'max_date': max_date}
     logger.info("Making master frames", extra_tags=extra_tags)
-    image_path_list = dbs.get_individual_calibration_images(instrument, frame_type, min_date, max_date,
-                                                            db_address=runtime_context.db_address)
+    if image_path_list is None:
+        image_path_list = dbs.get_individual_calibration_images(instrument, frame_type, min_date, max_date,
+                                                                db_address=runtime_context.db_address)
     if len(image_path_list) == 0:
         logger.info("No calibration frames found to stack", extra_tags=extra_tags)
+        return
 
     try:
         run_master_maker(image_path_list, runtime_context, frame_type)
@@ -1,7 +1,7 @@
 import os
 import logging
 from datetime import datetime, timedelta
-from dateutil.parser import parse
+from functools import lru_cache
 
 from celery import Celery
 
@@ -27,11 +27,17 @@ def setup_loggers(*args, **kwargs):
     logs.set_log_level(os.getenv('BANZAI_WORKER_LOGLEVEL', 'INFO'))
 
 
+@lru_cache(maxsize=None)
+def get_site_timezone(site, db_address):
+    # Site timezones are fixed UTC offsets, so each worker only needs to look them up once
+    return dbs.get_timezone(site, db_address=db_address)
+
+
 @app.task(name='celery.schedule_calibration_stacking')
 def schedule_calibration_stacking(site: str, runtime_context: dict, min_date=None, max_date=None, frame_types=None):
     runtime_context = Context(runtime_context)
     if min_date is None or max_date is None:
-        timezone_for_site = dbs.get_timezone(site, db_address=runtime_context.db_address)
+        timezone_for_site = get_site_timezone(site, runtime_context.db_address)
         min_date, max_date = date_utils.get_min_and_max_dates_for_calibration_scheduling(timezone_for_site)
 
     calibration_blocks = observation_utils.get_calibration_blocks_for_time_range(site, max_date, min_date)
@@ -39,11 +45,13 @@ def schedule_calibration_stacking(site: str, runtime_context: dict, min_date=Non
     if frame_types is None:
         frame_types = runtime_context.CALIBRATION_IMAGE_TYPES
 
+    # The instruments at a site do not depend on the frame type so only query for them once
+    instruments = dbs.get_instruments_at_site(site=site, db_address=runtime_context.db_address)
+    now = datetime.utcnow().replace(microsecond=0)
     for frame_type in frame_types:
         logger.info('Scheduling stacking', extra_tags={'site': site, 'min_date': min_date, 'max_date': max_date,
                                                        'frame_type': frame_type})
 
-        instruments = dbs.get_instruments_at_site(site=site, db_address=runtime_context.db_address)
         for instrument in instruments:
             logger.info('Checking for scheduled calibration blocks', extra_tags={'site': site, 'min_date': min_date,
                                                                                  'max_date': max_date,
@@ -53,9 +61,9 @@ def schedule_calibration_stacking(site: str, runtime_context: dict, min_date=Non
                                                                                    calibration_blocks)
             if len(blocks_for_calibration) > 0:
                 # block_end should be the latest block end time
-                calibration_end_time = max([parse(block['end']) for block in blocks_for_calibration]).replace(tzinfo=None)
+                calibration_end_time = max(date_utils.parse_iso_date(block['end'])
+                                           for block in blocks_for_calibration).replace(tzinfo=None)
                 stack_delay = timedelta(seconds=runtime_context.CALIBRATION_STACK_DELAYS[frame_type.upper()])
-                now = datetime.utcnow().replace(microsecond=0)
                 message_delay = calibration_end_time - now + stack_delay
                 if message_delay.days < 0:
                     message_delay_in_seconds = 0  # Remove delay if block end is in the past
@@ -66,8 +74,10 @@ def schedule_calibration_stacking(site: str, runtime_context: dict, min_date=Non
                 logger.info('Scheduling stacking at {}'.format(schedule_time.strftime(date_utils.TIMESTAMP_FORMAT)),
                             extra_tags={'site': site, 'min_date': min_date, 'max_date': max_date,
                                         'instrument': instrument.camera, 'frame_type': frame_type})
+                expected_image_count = observation_utils.get_expected_image_count(blocks_for_calibration,
+                                                                                  frame_type)
                 stack_calibrations.apply_async(args=(min_date, max_date, instrument.id, frame_type,
-                                                     vars(runtime_context), blocks_for_calibration),
+                                                     vars(runtime_context), expected_image_count),
                                                countdown=message_delay_in_seconds)
             else:
                 logger.warning('No scheduled calibration blocks found.',
@@ -77,22 +87,15 @@ def schedule_calibration_stacking(site: str, runtime_context: dict, min_date=Non
 
 @app.task(name='celery.stack_calibrations', bind=True, default_retry_delay=RETRY_DELAY)
 def stack_calibrations(self, min_date: str, max_date: str, instrument_id: int, frame_type: str,
-                       runtime_context: dict, observations: list):
+                       runtime_context: dict, expected_image_count: int):
     runtime_context = Context(runtime_context)
     instrument = dbs.get_instrument_by_id(instrument_id, db_address=runtime_context.db_address)
     logger.info('Checking if we are ready to stack',
                 extra_tags={'site': instrument.site, 'min_date': min_date, 'max_date': max_date,
                             'instrument': instrument.camera, 'frame_type': frame_type})
 
-    completed_image_count = len(dbs.get_individual_calibration_images(instrument, frame_type,
-                                                                      min_date, max_date, include_bad_frames=True,
-                                                                      db_address=runtime_context.db_address))
-    expected_image_count = 0
-    for observation in observations:
-        for configuration in observation['request']['configurations']:
-            if frame_type.upper() == configuration['type']:
-                for instrument_config in configuration['instrument_configs']:
-                    expected_image_count += instrument_config['exposure_count']
+    image_path_list, completed_image_count = dbs.get_individual_calibration_images_and_count(
+        instrument, frame_type, min_date, max_date, db_address=runtime_context.db_address)
     logger.info('expected image count: {0}, completed image count: {1}'.format(str(expected_image_count), str(completed_image_count)))
     if completed_image_count < expected_image_count and self.request.retries < 3:
         logger.info('Number of processed images less than expected. '
@@ -104,7 +107,8 @@ def stack_calibrations(self, min_date: str, max_date: str, instrument_id: int, f
         logger.info('Starting to stack', extra_tags={'site': instrument.site, 'min_date': min_date,
                                                       'max_date': max_date, 'instrument': instrument.camera,
                                                       'frame_type': frame_type})
-        calibrations.process_master_maker(instrument, frame_type, min_date, max_date, runtime_context)
+        calibrations.process_master_maker(instrument, frame_type, min_date, max_date, runtime_context,
+                                          image_path_list=image_path_list)
 
 
 @app.task(name='celery.process_image')
@@ -113,7 +117,8 @@ def process_image(path: str, runtime_context: dict):
     logger.info('Running process image.')
     try:
         if realtime_utils.need_to_process_image(path, runtime_context):
-            logger.info('Reducing frame', extra_tags={'filename': os.path.basename(path)})
+            if logger.isEnabledFor(logging.INFO):
+                logger.info('Reducing frame', extra_tags={'filename': os.path.basename(path)})
 
             # Increment the number of tries for this file
             realtime_utils.increment_try_number(path, db_address=runtime_context.db_address)
@@ -122,5 +127,6 @@ def process_image(path: str, runtime_context: dict):
             realtime_utils.set_file_as_processed(path, db_address=runtime_context.db_address)
 
     except Exception:
-        logger.error("Exception processing frame: {error}".format(error=logs.format_exception()),
-                     extra_tags={'filename': os.path.basename(path)})
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("Exception processing frame: %s", logs.format_exception(),
+                         extra_tags={'filename': os.path.basename(path)})
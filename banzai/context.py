@@ -4,8 +4,8 @@ class Context:
             args_dict = vars(args)
         else:
             args_dict = args
-        for key in args_dict:
-            super(Context, self).__setattr__(key, args_dict[key])
+        # Update the instance dictionary directly rather than going through __setattr__ for each key
+        self.__dict__.update(args_dict)
 
     def __delattr__(self, item):
         raise TypeError('Deleting attribute is not allowed. PipelineContext is immutable')
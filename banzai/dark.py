@@ -68,7 +68,9 @@ class DarkComparer(CalibrationComparer):
         return True
 
     def noise_model(self, image):
-        poisson_noise = np.where(image.data > 0, image.data * image.exptime, 0.0)
-        noise = (image.readnoise ** 2.0 + poisson_noise) ** 0.5
+        noise = np.where(image.data > 0, image.data * image.exptime, 0.0)
+        # Add the read noise and take the square root in place to avoid extra full frame temporaries
+        noise += image.readnoise ** 2.0
+        np.sqrt(noise, out=noise)
         noise /= image.exptime
         return noise
@@ -15,12 +15,13 @@ from dateutil.parser import parse
 
 import numpy as np
 import requests
-from sqlalchemy import create_engine, pool, desc, type_coerce, cast
+from sqlalchemy import create_engine, desc, type_coerce, cast
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, CHAR, JSON, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql.expression import true
 from contextlib import contextmanager
+from functools import lru_cache
 
 from banzai.utils import date_utils, fits_utils
 
@@ -32,6 +33,8 @@ _CONFIGDB_ADDRESS = 'http://configdb.lco.gtn/sites/'
 
 INSTRUMENT_STATES_TO_REDUCE = ['SCHEDULABLE', 'STANDBY']
 
+INSTRUMENT_EQUIVALENCE_ATTRIBUTES = ('site', 'enclosure', 'telescope', 'camera', 'name')
+
 Base = declarative_base()
 
 logger = logging.getLogger('banzai')
@@ -46,8 +49,8 @@ def get_session(db_address=_DEFAULT_DB):
     -------
     session: SQLAlchemy Database Session
     """
-    # Build a new engine for each session. This makes things thread safe.
-    engine = create_engine(db_address, poolclass=pool.NullPool)
+    # Engines are thread safe so we share one per process rather than reconnecting to the database for every session.
+    engine = _get_engine(db_address)
     Base.metadata.bind = engine
 
     # We don't use autoflush typically. I have run into issues where SQLAlchemy would try to flush
@@ -64,6 +67,32 @@ def get_session(db_address=_DEFAULT_DB):
         session.close()
 
 
+# Engines created by this process and engines inherited from the parent when this process was forked
+_engines = []
+_inherited_engines = []
+
+
+@lru_cache(maxsize=None)
+def _get_engine(db_address):
+    # Check that pooled connections are still alive before using them as the database may close idle connections
+    engine = create_engine(db_address, pool_pre_ping=True)
+    _engines.append(engine)
+    return engine
+
+
+def _dispose_engines_after_fork():
+    # A forked child shares the sockets of its parent's pooled connections so it must neither use nor close them
+    # (closing would tell the database to end the parent's sessions). We drop the inherited engines from the cache so
+    # the child builds its own pools, but keep them referenced so garbage collection never closes the connections.
+    _inherited_engines.extend(_engines)
+    _engines.clear()
+    _get_engine.cache_clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+
 class CalibrationImage(Base):
     """
     Master Calibration Image Database Record
@@ -225,28 +254,34 @@ def populate_instrument_tables(db_address=_DEFAULT_DB,
         db_session.commit()
 
         # Set all instruments in the table to be schedulable and turn them back on below as needed.
-        all_instruments = db_session.query(Instrument).all()
-        for instrument in all_instruments:
-            instrument.schedulable = False
-        db_session.commit()
+        # Keep the existing records around so we don't need to query for each instrument in the configdb.
+        existing_instruments = {}
+        for record in db_session.query(Instrument).all():
+            record.schedulable = False
+            instrument_key = tuple(getattr(record, attribute) for attribute in INSTRUMENT_EQUIVALENCE_ATTRIBUTES)
+            existing_instruments.setdefault(instrument_key, record)
 
         for instrument in instruments:
-            add_instrument(instrument, db_session=db_session)
+            record_attributes = _get_instrument_record_attributes(instrument)
+            instrument_key = tuple(instrument[attribute] for attribute in INSTRUMENT_EQUIVALENCE_ATTRIBUTES)
+            record = existing_instruments.get(instrument_key)
+            if record is None:
+                record = Instrument(**record_attributes)
+                db_session.add(record)
+                existing_instruments[instrument_key] = record
+            for attribute in record_attributes:
+                setattr(record, attribute, record_attributes[attribute])
+        db_session.commit()
+
+
+def _get_instrument_record_attributes(instrument):
+    return {attribute: instrument[attribute]
+            for attribute in INSTRUMENT_EQUIVALENCE_ATTRIBUTES + ('type', 'schedulable')}
 
 
 def add_instrument(instrument, db_session):
-    equivalence_criteria = {'site': instrument['site'],
-                            'enclosure': instrument['enclosure'],
-                            'telescope': instrument['telescope'],
-                            'camera': instrument['camera'],
-                            'name': instrument['name']}
-    record_attributes = {'site': instrument['site'],
-                         'enclosure': instrument['enclosure'],
-                         'telescope': instrument['telescope'],
-                         'camera': instrument['camera'],
-                         'name': instrument['name'],
-                         'type': instrument['type'],
-                         'schedulable': instrument['schedulable']}
+    equivalence_criteria = {attribute: instrument[attribute] for attribute in INSTRUMENT_EQUIVALENCE_ATTRIBUTES}
+    record_attributes = _get_instrument_record_attributes(instrument)
 
     add_or_update_record(db_session, Instrument, equivalence_criteria, record_attributes)
     db_session.commit()
@@ -298,9 +333,7 @@ def populate_calibration_table_with_bpms(directory, db_address=_DEFAULT_DB):
         bpm_filenames = glob(os.path.join(directory, '*bpm*.fits*'))
         for bpm_filename in bpm_filenames:
 
-            hdu = fits_utils.open_fits_file(bpm_filename)
-
-            header = hdu[0].header
+            header = fits_utils.get_primary_header(bpm_filename)
             ccdsum = header.get('CCDSUM')
             configuration_mode = fits_utils.get_configuration_mode(header)
 
@@ -486,9 +519,8 @@ def get_master_calibration_image(image, calibration_type, master_selection_crite
     return calibration_file
 
 
-def get_individual_calibration_images(instrument, calibration_type, min_date: str, max_date: str,
-                                      include_bad_frames=False, db_address=_DEFAULT_DB):
-
+def _query_individual_calibration_images(instrument, calibration_type, min_date: str, max_date: str,
+                                         include_bad_frames=False, db_address=_DEFAULT_DB):
     calibration_criteria = CalibrationImage.instrument_id == instrument.id
     calibration_criteria &= CalibrationImage.type == calibration_type.upper()
     calibration_criteria &= CalibrationImage.dateobs >= parse(min_date).replace(tzinfo=None)
@@ -499,12 +531,45 @@ def get_individual_calibration_images(instrument, calibration_type, min_date: st
 
     with get_session(db_address=db_address) as db_session:
         images = db_session.query(CalibrationImage).filter(calibration_criteria).all()
+    return images
+
+
+def get_individual_calibration_images(instrument, calibration_type, min_date: str, max_date: str,
+                                      include_bad_frames=False, db_address=_DEFAULT_DB):
+    images = _query_individual_calibration_images(instrument, calibration_type, min_date, max_date,
+                                                  include_bad_frames=include_bad_frames, db_address=db_address)
 
     image_paths = [os.path.join(image.filepath, image.filename) for image in images]
 
     return image_paths
 
 
+def get_individual_calibration_images_and_count(instrument, calibration_type, min_date: str, max_date: str,
+                                                db_address=_DEFAULT_DB):
+    """
+    Get the good individual calibration frames and the total number of frames, including bad ones
+
+    Returns
+    -------
+    image_paths: list of str
+                 Paths to the individual calibration frames that are not marked as bad
+    n_images: int
+              Number of individual calibration frames in the date range, including bad frames
+
+    Notes
+    -----
+    This only makes a single query to the database rather than one for the count and one for the
+    frames to stack.
+    """
+    images = _query_individual_calibration_images(instrument, calibration_type, min_date, max_date,
+                                                  include_bad_frames=True, db_address=db_address)
+
+    # Match the is_bad == False filter in SQL, which also leaves out frames where is_bad is NULL
+    image_paths = [os.path.join(image.filepath, image.filename) for image in images if image.is_bad is False]
+
+    return image_paths, len(images)
+
+
 def mark_frame(filename, mark_as, db_address=_DEFAULT_DB):
     set_is_bad_to = True if mark_as == "bad" else False
     logger.debug("Setting the is_bad parameter for {filename} to {set_is_bad_to}".format(
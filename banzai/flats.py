@@ -77,7 +77,9 @@ class FlatComparer(CalibrationComparer):
 
     def noise_model(self, image):
         flat_normalization = float(image.header['FLATLVL'])
-        poisson_noise = np.where(image.data > 0, image.data * flat_normalization, 0.0)
-        noise = (image.readnoise ** 2.0 + poisson_noise) ** 0.5
+        noise = np.where(image.data > 0, image.data * flat_normalization, 0.0)
+        # Add the read noise and take the square root in place to avoid extra full frame temporaries
+        noise += image.readnoise ** 2.0
+        np.sqrt(noise, out=noise)
         noise /= flat_normalization
         return noise
@@ -149,7 +149,9 @@ class Image(object):
         hdu_list = self._get_hdu_list()
         base_filename = os.path.basename(filepath).split('.fz')[0]
         with tempfile.TemporaryDirectory() as temp_directory:
-            hdu_list.writeto(os.path.join(temp_directory, base_filename), overwrite=True, output_verify='fix+warn')
+            # Be explicit that we don't want an extra pass over the pixels to compute CHECKSUM/DATASUM
+            hdu_list.writeto(os.path.join(temp_directory, base_filename), overwrite=True, output_verify='fix+warn',
+                             checksum=False)
             hdu_list.close()
             if fpack:
                 if os.path.exists(filepath):
@@ -160,7 +162,8 @@ class Image(object):
             shutil.move(os.path.join(temp_directory, base_filename), filepath)
 
     def _get_hdu_list(self):
-        image_hdu = fits.PrimaryHDU(self.data.astype(np.float32), header=self.header)
+        # Don't make a copy of the data if it is already in the output type (e.g. master calibrations)
+        image_hdu = fits.PrimaryHDU(self.data.astype(np.float32, copy=False), header=self.header)
         image_hdu.header['BITPIX'] = -32
         image_hdu.header['BSCALE'] = 1.0
         image_hdu.header['BZERO'] = 0.0
@@ -194,7 +197,7 @@ class Image(object):
 
     def _add_bpm_to_hdu_list(self, hdu_list):
         if self.bpm is not None:
-            bpm_hdu = fits.ImageHDU(self.bpm.astype(np.uint8))
+            bpm_hdu = fits.ImageHDU(self.bpm.astype(np.uint8, copy=False))
             bpm_hdu.name = 'BPM'
             hdu_list.append(bpm_hdu)
         return hdu_list
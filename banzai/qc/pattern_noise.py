@@ -1,6 +1,7 @@
 import logging
 
 import numpy as np
+from scipy import fft
 from scipy.ndimage.filters import median_filter
 from itertools import groupby
 from operator import itemgetter
@@ -127,16 +128,17 @@ def get_2d_power_band(data, fractional_band_width=0.25, fractional_inner_edge_to
     power_2d : numpy array
         Central band of 2d Fourier transform
     """
-    # Get full 2D power
-    full_power_2d = abs(np.fft.rfft2(data))
+    # Get full 2D Fourier transform
+    full_fft_2d = fft.rfft2(data)
 
     # Extract horizontal band, as corners of 2D FFT can vary significantly between images
-    ny, nx = full_power_2d.shape
+    ny, nx = full_fft_2d.shape
     y1 = int(ny * (0.5 - fractional_band_width/2))
     y2 = int(ny * (0.5 + fractional_band_width/2))
     x1 = int(nx * fractional_inner_edge_to_discard)
 
-    return full_power_2d[y1:y2, x1:]
+    # Only take the amplitude of the band we keep
+    return np.abs(full_fft_2d[y1:y2, x1:])
 
 
 def compute_snr(power_2d, fractional_window_size=0.05):
@@ -19,7 +19,7 @@ class Stage(abc.ABC):
     def run(self, image):
         if image is None:
             return image
-        logger.info('Running {0}'.format(self.stage_name), image=image)
+        logger.info('Running %s', self.stage_name, image=image)
         try:
             image = self.do_stage(image)
             return image
@@ -59,7 +59,7 @@ class MultiFrameStage(abc.ABC):
         for _, image_set in itertools.groupby(images, self.get_grouping):
             try:
                 image_set = list(image_set)
-                logger.info('Running {0}'.format(self.stage_name), image=image_set[0])
+                logger.info('Running %s', self.stage_name, image=image_set[0])
                 processed_images += self.do_stage(image_set)
             except Exception:
                 logger.error(logs.format_exception())
@@ -19,3 +19,24 @@ def test_pruning_nans():
     assert 51 not in t['a']
     assert 32 not in t['a']
     assert 78 not in t['a']
+
+
+def test_pruning_nans_skips_non_float_columns():
+    a = np.arange(10, dtype=float)
+    b = np.arange(10, dtype=int)
+    c = np.array(['source{0}'.format(i) for i in range(10)])
+
+    a[3] = np.nan
+
+    t = Table([a, b, c], names=('a', 'b', 'c'))
+    t = array_utils.prune_nans_from_table(t)
+    assert len(t) == 9
+    assert 3 not in t['b']
+    assert 'source3' not in t['c']
+
+
+def test_array_indices_to_slices_crops_to_shape():
+    small_array = np.zeros((3, 4))
+    large_array = np.arange(30).reshape(5, 6)
+    slices = array_utils.array_indices_to_slices(small_array)
+    np.testing.assert_array_equal(large_array[slices], large_array[0:3:1, 0:4:1])
@@ -2,6 +2,7 @@ import mock
 import numpy as np
 
 from banzai.bias import BiasMaker
+from banzai.utils import stats
 from banzai.tests.utils import FakeContext, handles_inhomogeneous_set, FakeInstrument
 from banzai.tests.bias_utils import FakeBiasImage, make_context_with_master_bias
 
@@ -82,3 +83,45 @@ def test_makes_a_sensible_master_bias(mock_frame, mock_namer):
     assert np.abs(np.mean(master_bias)) < 0.1
     actual_readnoise = np.std(master_bias)
     assert np.abs(actual_readnoise - expected_readnoise / (nimages ** 0.5)) < 0.2
+
+
+@mock.patch('banzai.utils.file_utils.make_calibration_filename_function')
+@mock.patch('banzai.calibrations.FRAME_CLASS', side_effect=FakeBiasImage)
+def test_stacking_in_tiles_matches_stacking_full_frame(mock_frame, mock_namer):
+    mock_namer.return_value = lambda *x: 'foo.fits'
+    nimages = 7
+
+    images = [FakeBiasImage() for x in range(nimages)]
+    for image in images:
+        image.data = np.random.normal(loc=0.0, scale=15.0, size=(image.ny, image.nx)).astype(np.float32)
+        image.bpm = (np.random.uniform(size=(image.ny, image.nx)) < 0.1).astype(np.uint8)
+    data_stack = np.stack([image.data for image in images], axis=-1)
+    data_stack[np.stack([image.bpm for image in images], axis=-1) > 0] = np.nan
+    expected = stats.nan_sigma_clipped_mean(data_stack, 3.0, axis=-1)
+
+    maker = BiasMaker(FakeContext(frame_class=FakeBiasImage))
+    # Make the tiles a few rows high so that the last tile is a partial one
+    maker.TILE_SIZE_IN_BYTES = 4 * images[0].nx * nimages * 4
+    master_bias = maker.do_stage(images)[0].data
+    np.testing.assert_allclose(master_bias, expected)
+
+
+@mock.patch('banzai.utils.file_utils.make_calibration_filename_function')
+@mock.patch('banzai.calibrations.FRAME_CLASS', side_effect=FakeBiasImage)
+def test_master_bpm_flags_pixels_with_no_good_data(mock_frame, mock_namer):
+    mock_namer.return_value = lambda *x: 'foo.fits'
+    nimages = 5
+
+    images = [FakeBiasImage() for x in range(nimages)]
+    for image in images:
+        image.data = np.random.normal(loc=10.0, scale=1.0, size=(image.ny, image.nx)).astype(np.float32)
+        image.bpm = np.zeros((image.ny, image.nx), dtype=np.uint8)
+        image.bpm[5:8, 10:20] = 1
+
+    maker = BiasMaker(FakeContext(frame_class=FakeBiasImage))
+    maker.TILE_SIZE_IN_BYTES = 4 * images[0].nx * nimages * 4
+    master_image = maker.do_stage(images)[0]
+    expected_bpm = np.zeros((images[0].ny, images[0].nx), dtype=np.uint8)
+    expected_bpm[5:8, 10:20] = 1
+    assert master_image.bpm.dtype == np.uint8
+    np.testing.assert_array_equal(master_image.bpm, expected_bpm)
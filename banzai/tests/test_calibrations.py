@@ -0,0 +1,78 @@
+import mock
+import numpy as np
+
+from banzai import calibrations
+from banzai.tests.utils import FakeContext, FakeInstrument
+
+
+@mock.patch('banzai.calibrations.run_master_maker')
+@mock.patch('banzai.calibrations.dbs.get_individual_calibration_images')
+def test_process_master_maker_does_not_stack_without_frames(mock_get_calibration_images, mock_run_master_maker):
+    mock_get_calibration_images.return_value = []
+    calibrations.process_master_maker(FakeInstrument(), 'BIAS', '2019-02-19T20:27:49', '2019-02-20T09:55:09',
+                                      FakeContext())
+    mock_run_master_maker.assert_not_called()
+
+
+@mock.patch('banzai.calibrations.run_master_maker')
+@mock.patch('banzai.calibrations.dbs.get_individual_calibration_images')
+def test_process_master_maker_stacks_frames(mock_get_calibration_images, mock_run_master_maker):
+    mock_get_calibration_images.return_value = ['/tmp/bias1.fits', '/tmp/bias2.fits']
+    context = FakeContext()
+    calibrations.process_master_maker(FakeInstrument(), 'BIAS', '2019-02-19T20:27:49', '2019-02-20T09:55:09',
+                                      context)
+    mock_run_master_maker.assert_called_with(['/tmp/bias1.fits', '/tmp/bias2.fits'], context, 'BIAS')
+
+
+@mock.patch('banzai.calibrations.import_utils.import_attribute')
+@mock.patch('banzai.calibrations.image_utils.read_image')
+def test_run_master_maker_keeps_frames_in_order(mock_read_image, mock_import_attribute):
+    image_path_list = ['/tmp/bias{0}.fits'.format(i) for i in range(20)]
+    mock_read_image.side_effect = lambda image_path, runtime_context: image_path
+    mock_stage = mock_import_attribute.return_value.return_value
+    mock_stage.run.return_value = []
+    context = FakeContext()
+    context.n_stack_workers = 4
+    calibrations.run_master_maker(image_path_list, context, 'BIAS')
+    mock_stage.run.assert_called_with(image_path_list)
+
+
+@mock.patch('banzai.calibrations.import_utils.import_attribute')
+@mock.patch('banzai.calibrations.image_utils.read_image')
+def test_run_master_maker_writes_every_master(mock_read_image, mock_import_attribute):
+    master_images = [mock.MagicMock() for i in range(3)]
+    mock_import_attribute.return_value.return_value.run.return_value = master_images
+    context = FakeContext()
+    calibrations.run_master_maker(['/tmp/flat1.fits', '/tmp/flat2.fits'], context, 'SKYFLAT')
+    for master_image in master_images:
+        master_image.write.assert_called_once_with(context)
+
+
+@mock.patch('banzai.calibrations.os.cpu_count', return_value=3)
+@mock.patch('banzai.calibrations.ThreadPoolExecutor')
+@mock.patch('banzai.calibrations.import_utils.import_attribute')
+def test_run_master_maker_defaults_to_one_worker_per_core(mock_import_attribute, mock_executor, mock_cpu_count):
+    calibrations.run_master_maker(['/tmp/bias1.fits'], FakeContext(), 'BIAS')
+    mock_executor.assert_called_with(max_workers=3)
+
+
+def test_count_deviant_pixels_matches_full_frame_count():
+    np.random.seed(1012)
+    data = np.random.normal(0.0, 10.0, size=(103, 101)).astype(np.float32)
+    reference_data = np.random.normal(0.0, 10.0, size=(103, 101)).astype(np.float32)
+    threshold = np.random.uniform(5.0, 20.0, size=(103, 101)).astype(np.float32)
+    expected = np.sum(np.abs(data - reference_data) >= threshold)
+    # Use blocks of a few rows so the last block is only partially filled
+    n_deviant_pixels = calibrations._count_deviant_pixels(data, reference_data, threshold,
+                                                          block_size_in_bytes=5 * 101 * 4)
+    assert n_deviant_pixels == expected
+    n_deviant_pixels = calibrations._count_deviant_pixels(data, reference_data, 10.0)
+    assert n_deviant_pixels == np.sum(np.abs(data - reference_data) >= 10.0)
+
+
+def test_count_deviant_pixels_with_zero_noise():
+    data = np.array([[1.0, 2.0], [3.0, 4.0]])
+    reference_data = np.array([[1.0, 2.5], [3.0, 4.0]])
+    threshold = np.array([[0.0, 0.0], [0.0, 1.0]])
+    # Only the pixel that differs counts, matching |data - reference_data| / noise >= SNR
+    assert calibrations._count_deviant_pixels(data, reference_data, threshold) == 1
@@ -6,12 +6,11 @@ from unittest.mock import ANY
 
 from celery.exceptions import Retry
 
-from banzai.celery import stack_calibrations, schedule_calibration_stacking
+from banzai.celery import stack_calibrations, schedule_calibration_stacking, get_site_timezone
 from banzai.settings import CALIBRATION_STACK_DELAYS
 from banzai.utils import date_utils
 from banzai.context import Context
 from banzai.tests.utils import FakeInstrument
-from banzai.tests.bias_utils import FakeBiasImage
 
 # TODO: update tests to use same mock lake data as e2e tests
 
@@ -191,8 +190,7 @@ class TestMain():
         mock_filter_blocks.return_value = [block for block in self.fake_blocks_response_json['results']]
         schedule_calibration_stacking(self.site, self.context, self.min_date, self.max_date)
         mock_stack_calibrations.assert_called_with(args=(self.min_date, self.max_date, self.fake_inst.id,
-                                                         self.frame_type, vars(self.context),
-                                                         mock_filter_blocks.return_value),
+                                                         self.frame_type, vars(self.context), 4),
                                                    countdown=0)
 
     @mock.patch('banzai.celery.stack_calibrations.apply_async')
@@ -208,27 +206,43 @@ class TestMain():
         mock_filter_blocks.return_value = [block for block in self.fake_blocks_response_json['results']]
         schedule_calibration_stacking(self.site, self.context, self.min_date, self.max_date)
         mock_stack_calibrations.assert_called_with(args=(self.min_date, self.max_date, self.fake_inst.id,
-                                                         self.frame_type, vars(self.context),
-                                                         mock_filter_blocks.return_value),
+                                                         self.frame_type, vars(self.context), 4),
                                                    countdown=(60+CALIBRATION_STACK_DELAYS['BIAS']))
 
+    @mock.patch('banzai.celery.stack_calibrations.apply_async')
+    @mock.patch('banzai.celery.dbs.get_instruments_at_site')
+    @mock.patch('banzai.utils.observation_utils.get_calibration_blocks_for_time_range')
+    @mock.patch('banzai.utils.observation_utils.filter_calibration_blocks_for_type')
+    @mock.patch('banzai.celery.dbs.get_timezone')
+    def test_site_timezone_is_only_looked_up_once(self, mock_get_timezone, mock_filter_blocks, mock_get_blocks,
+                                                  mock_get_instruments, mock_stack_calibrations, setup):
+        get_site_timezone.cache_clear()
+        mock_get_timezone.return_value = 10
+        mock_get_instruments.return_value = [self.fake_inst]
+        mock_get_blocks.return_value = self.fake_blocks_response_json
+        mock_filter_blocks.return_value = []
+        schedule_calibration_stacking(self.site, self.context)
+        schedule_calibration_stacking(self.site, self.context)
+        mock_get_timezone.assert_called_once_with(self.site, db_address=self.context.db_address)
+        assert mock_get_blocks.call_count == 2
+        get_site_timezone.cache_clear()
+
     @mock.patch('banzai.calibrations.process_master_maker')
-    @mock.patch('banzai.celery.dbs.get_individual_calibration_images')
+    @mock.patch('banzai.celery.dbs.get_individual_calibration_images_and_count')
     @mock.patch('banzai.celery.dbs.get_instrument_by_id')
     def test_stack_calibrations(self, mock_get_instrument, mock_get_calibration_images, mock_process_master_maker, setup):
         mock_get_instrument.return_value = self.fake_inst
-        mock_get_calibration_images.return_value = [FakeBiasImage(), FakeBiasImage()]
-        stack_calibrations(self.min_date, self.max_date, 1, self.frame_type, self.context,
-                           [self.fake_blocks_response_json['results'][0]])
-        mock_process_master_maker.assert_called_with(self.fake_inst, self.frame_type, self.min_date, self.max_date, ANY)
+        mock_get_calibration_images.return_value = ['/tmp/bias1.fits', '/tmp/bias2.fits'], 2
+        stack_calibrations(self.min_date, self.max_date, 1, self.frame_type, self.context, 2)
+        mock_process_master_maker.assert_called_with(self.fake_inst, self.frame_type, self.min_date, self.max_date, ANY,
+                                                     image_path_list=['/tmp/bias1.fits', '/tmp/bias2.fits'])
 
     @mock.patch('banzai.calibrations.process_master_maker')
-    @mock.patch('banzai.celery.dbs.get_individual_calibration_images')
+    @mock.patch('banzai.celery.dbs.get_individual_calibration_images_and_count')
     @mock.patch('banzai.celery.dbs.get_instrument_by_id')
     def test_stack_calibrations_not_enough_images(self, mock_get_instrument, mock_get_calibration_images, mock_process_master_maker, setup):
         mock_get_instrument.return_value = self.fake_inst
-        mock_get_calibration_images.return_value = [FakeBiasImage()]
+        mock_get_calibration_images.return_value = ['/tmp/bias1.fits'], 1
         with pytest.raises(Retry) as e:
-            stack_calibrations(self.min_date, self.max_date, 1, self.frame_type, self.context,
-                               [self.fake_blocks_response_json['results'][0]])
+            stack_calibrations(self.min_date, self.max_date, 1, self.frame_type, self.context, 2)
         assert e.type is Retry
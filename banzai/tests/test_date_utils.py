@@ -65,3 +65,13 @@ def test_get_expected_min_and_max_dates_for_calibration_scheduling(mock_get_dayo
         calculated_min_date, calculated_max_date = date_utils.get_min_and_max_dates_for_calibration_scheduling(data['timezone'])
         assert calculated_min_date == data['expected_min_date'].strftime(date_utils.TIMESTAMP_FORMAT)
         assert calculated_max_date == data['expected_max_date'].strftime(date_utils.TIMESTAMP_FORMAT)
+
+
+def test_parse_iso_date():
+    assert date_utils.parse_iso_date('2019-06-10T10:50:00') == datetime(2019, 6, 10, 10, 50)
+
+
+def test_parse_iso_date_with_utc_suffix():
+    parsed_date = date_utils.parse_iso_date('2019-06-10T10:50:00.5Z')
+    assert parsed_date.replace(tzinfo=None) == datetime(2019, 6, 10, 10, 50, 0, 500000)
+    assert parsed_date.utcoffset() == timedelta(0)
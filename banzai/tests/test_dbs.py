@@ -1,9 +1,10 @@
 import os
+import datetime
 
 import mock
 
 from banzai import dbs
-from banzai.tests.utils import FakeResponse
+from banzai.tests.utils import FakeResponse, FakeInstrument
 from astropy.utils.data import get_pkg_data_filename
 
 
@@ -54,6 +55,45 @@ def test_add_or_update():
         db_session.commit()
 
 
+def test_sessions_share_an_engine():
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        engine = db_session.get_bind()
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        assert db_session.get_bind() is engine
+
+
+def test_forked_process_does_not_reuse_parents_engine():
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        parent_engine = db_session.get_bind()
+        parent_pool = parent_engine.pool
+    dbs._dispose_engines_after_fork()
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        child_engine = db_session.get_bind()
+    assert child_engine is not parent_engine
+    assert child_engine.pool is not parent_pool
+    # The inherited pool must be left untouched so the parent's connections stay open
+    assert parent_engine.pool is parent_pool
+    assert parent_engine in dbs._inherited_engines
+
+
+def test_fork_hook_gives_child_a_new_pool():
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        parent_pool = db_session.get_bind().pool
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+                new_pool = db_session.get_bind().pool is not parent_pool
+            os.write(write_end, b'1' if new_pool else b'0')
+        finally:
+            os._exit(0)
+    os.close(write_end)
+    os.waitpid(pid, 0)
+    assert os.read(read_end, 1) == b'1'
+    os.close(read_end)
+
+
 def test_removing_duplicates():
     nres_inst = {'site': 'tlv', 'name': 'nres01', 'camera': 'fa18', 'schedulable': True}
     other_inst = {'site': 'tlv', 'name': 'cam01', 'camera': 'fa12', 'schedulable': True}
@@ -92,3 +132,37 @@ def test_standby_marked_schedulable():
     instrument = dbs.query_for_instrument(db_address='sqlite:///test.db', site='coj', camera='kb98')
     assert instrument.name == 'kb98'
     assert instrument.schedulable == True
+
+
+@mock.patch('banzai.dbs.requests.get', return_value=FakeResponse(get_pkg_data_filename('data/configdb_example.json',
+                                                                                       'banzai.tests')))
+def test_populating_instruments_twice_updates_existing_records(mockrequests):
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        n_instruments = db_session.query(dbs.Instrument).count()
+    dbs.populate_instrument_tables(db_address='sqlite:///test.db')
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        assert db_session.query(dbs.Instrument).count() == n_instruments
+    instrument = dbs.query_for_instrument(db_address='sqlite:///test.db', site='coj', camera='kb98')
+    assert instrument.schedulable
+
+
+def test_get_individual_calibration_images_and_count():
+    instrument = FakeInstrument(id=9999)
+    with dbs.get_session(db_address='sqlite:///test.db') as db_session:
+        for filename, is_bad in [('good1.fits', False), ('good2.fits', False), ('bad1.fits', True),
+                                 ('unmarked1.fits', None)]:
+            dbs.add_or_update_record(db_session, dbs.CalibrationImage, {'filename': filename},
+                                     {'type': 'BIAS', 'filename': filename, 'filepath': '/tmp',
+                                      'dateobs': datetime.datetime(2019, 2, 20), 'instrument_id': instrument.id,
+                                      'is_master': False, 'is_bad': is_bad, 'attributes': {}})
+        db_session.commit()
+
+    image_paths, n_images = dbs.get_individual_calibration_images_and_count(instrument, 'bias', '2019-02-19T20:27:49',
+                                                                            '2019-02-20T09:55:09',
+                                                                            db_address='sqlite:///test.db')
+    assert sorted(image_paths) == ['/tmp/good1.fits', '/tmp/good2.fits']
+    assert n_images == 4
+    # The good frames should be the same ones that the SQL filter returns
+    good_image_paths = dbs.get_individual_calibration_images(instrument, 'bias', '2019-02-19T20:27:49',
+                                                             '2019-02-20T09:55:09', db_address='sqlite:///test.db')
+    assert sorted(image_paths) == sorted(good_image_paths)
@@ -0,0 +1,55 @@
+import hashlib
+import os
+
+import mock
+import numpy as np
+from kombu import Connection, Exchange, Queue
+
+from banzai.utils import file_utils
+from banzai.tests.utils import FakeContext
+
+
+def test_get_md5_matches_hash_of_whole_file(tmpdir):
+    contents = np.random.randint(0, 256, size=3 * 1024 + 17, dtype=np.uint8).tobytes()
+    filepath = tmpdir.join('test.fits')
+    filepath.write_binary(contents)
+    assert file_utils.get_md5(str(filepath), chunk_size=1024) == hashlib.md5(contents).hexdigest()
+
+
+def test_make_output_directory_when_it_already_exists(tmpdir):
+    runtime_context = FakeContext()
+    runtime_context.processed_path = str(tmpdir)
+    runtime_context.preview_mode = False
+    image = mock.Mock(site='elp', epoch='20160101')
+    image.instrument.name = 'kb76'
+    expected_directory = os.path.join(str(tmpdir), 'elp', 'kb76', '20160101', 'processed')
+    assert file_utils.make_output_directory(runtime_context, image) == expected_directory
+    assert os.path.isdir(expected_directory)
+    assert file_utils.make_output_directory(runtime_context, image) == expected_directory
+
+
+def test_post_to_archive_queue():
+    exchange = Exchange('test_fits_files', type='fanout')
+    with Connection('memory://') as connection:
+        queue = Queue('test_archive', exchange)(connection)
+        queue.declare()
+        file_utils.post_to_archive_queue('/tmp/test1.fits', 'memory://', exchange_name='test_fits_files')
+        file_utils.post_to_archive_queue('/tmp/test2.fits', 'memory://', exchange_name='test_fits_files')
+        assert queue.get(no_ack=True).payload == {'path': '/tmp/test1.fits'}
+        assert queue.get(no_ack=True).payload == {'path': '/tmp/test2.fits'}
+
+
+def test_instantly_public():
+    assert file_utils.instantly_public('calibrate')
+    assert file_utils.instantly_public('standard')
+    assert file_utils.instantly_public('LCOEPO2019B-001')
+    assert not file_utils.instantly_public('LCO2019B-001')
+    assert not file_utils.instantly_public('CALIBRATE')
+
+
+@mock.patch('banzai.utils.file_utils.pools')
+def test_post_to_archive_queue_bounds_retries(mock_pools):
+    file_utils.post_to_archive_queue('/tmp/test1.fits', 'memory://')
+    producer = mock_pools.producers.__getitem__.return_value.acquire.return_value.__enter__.return_value
+    retry_policy = producer.publish.call_args[1]['retry_policy']
+    assert retry_policy['max_retries'] is not None
@@ -1,3 +1,6 @@
+import os
+
+import mock
 import numpy as np
 from astropy.table import Table
 from astropy.io import fits
@@ -65,6 +68,20 @@ def test_get_sci_extensions():
         np.testing.assert_allclose(sci_extensions[i].data, input_data[i], atol=1e-5)
 
 
+def test_split_slice():
+    data = np.arange(1, 11)
+    np.testing.assert_array_equal(data[fits_utils.split_slice('3:7')], [3, 4, 5, 6, 7])
+    np.testing.assert_array_equal(data[fits_utils.split_slice('7:3')], [7, 6, 5, 4, 3])
+    np.testing.assert_array_equal(data[fits_utils.split_slice('4:1')], [4, 3, 2, 1])
+    np.testing.assert_array_equal(data[fits_utils.split_slice('5:5')], [5])
+
+
+def test_parse_region_keyword():
+    assert fits_utils.parse_region_keyword('[1:100,2:50]') == (slice(1, 50, 1), slice(0, 100, 1))
+    assert fits_utils.parse_region_keyword('N/A') is None
+    assert fits_utils.parse_region_keyword('') is None
+
+
 def test_open_image():
     for fpacked in [True, False]:
         # Read an image with only a single extension
@@ -72,3 +89,51 @@ def test_open_image():
         # Read an image with a single extension and a datacube
         # Read an image with multiple sci extensions
         pass
+
+
+def test_open_fits_file_data_available_after_file_is_removed(tmpdir):
+    data = np.random.normal(size=(10, 12)).astype(np.float32)
+    bpm = (np.random.uniform(size=(10, 12)) > 0.9).astype(np.uint8)
+    filename = str(tmpdir.join('test.fits'))
+    fits.HDUList([fits.PrimaryHDU(header=fits.Header({'OBSTYPE': 'BIAS'})),
+                  fits.ImageHDU(data=data, name='SCI'),
+                  fits.ImageHDU(data=bpm, name='BPM')]).writeto(filename)
+    hdulist = fits_utils.open_fits_file(filename)
+    os.remove(filename)
+    assert hdulist[0].header['OBSTYPE'] == 'BIAS'
+    np.testing.assert_array_equal(hdulist['SCI'].data, data)
+    np.testing.assert_array_equal(hdulist['BPM'].data, bpm)
+
+
+def test_get_primary_header(tmpdir):
+    header = fits.Header({'OBSTYPE': 'BIAS', 'SITEID': 'lsc'})
+    filename = str(tmpdir.join('test.fits'))
+    fits.HDUList([fits.PrimaryHDU(data=np.zeros((10, 10), dtype=np.float32), header=header)]).writeto(filename)
+    primary_header = fits_utils.get_primary_header(filename)
+    assert primary_header['OBSTYPE'] == 'BIAS'
+    assert primary_header['SITEID'] == 'lsc'
+
+
+def test_get_primary_header_from_fpacked_primary_image(tmpdir):
+    filename = str(tmpdir.join('test.fits.fz'))
+    fits.HDUList([fits.PrimaryHDU(),
+                  fits.CompImageHDU(data=np.zeros((10, 10), dtype=np.float32),
+                                    header=fits.Header({'OBSTYPE': 'DARK'}))]).writeto(filename)
+    # Mark the compressed image as having been the primary HDU like fpack does
+    with fits.open(filename, mode='update', disable_image_compression=True) as hdulist:
+        hdulist[1].header.insert('ZBITPIX', ('ZSIMPLE', True))
+    with mock.patch('banzai.utils.fits_utils.funpack') as mock_funpack:
+        assert fits_utils.get_primary_header(filename)['OBSTYPE'] == 'DARK'
+        mock_funpack.assert_not_called()
+
+
+def test_get_primary_header_from_fpacked_multi_extension_file(tmpdir):
+    filename = str(tmpdir.join('test.fits.fz'))
+    fits.HDUList([fits.PrimaryHDU(header=fits.Header({'OBSTYPE': 'SKYFLAT'})),
+                  fits.CompImageHDU(data=np.zeros((10, 10), dtype=np.float32),
+                                    header=fits.Header({'EXTNAME': 'SCI', 'OBSTYPE': 'WRONG'}))]).writeto(filename)
+    assert fits_utils.get_primary_header(filename)['OBSTYPE'] == 'SKYFLAT'
+
+
+def test_get_primary_header_missing_file(tmpdir):
+    assert fits_utils.get_primary_header(str(tmpdir.join('missing.fits'))) is None
@@ -85,3 +85,19 @@ def test_data_table_adds_columns():
     assert np.allclose(data_table['b'], np.arange(2))
     data_table.add_column(np.arange(1, 3), name='c', index=1)
     assert np.allclose(data_table['c'], np.arange(1, 3))
+
+
+def test_write_hdu_list_does_not_copy_float32_data(tmpdir):
+    test_image = Image(FakeContext(), filename=None)
+    test_image.data = np.random.normal(size=(10, 12)).astype(np.float32)
+    test_image.bpm = np.zeros((10, 12), dtype=np.uint8)
+    test_image.header = fits.Header({'OBSTYPE': 'BIAS'})
+    hdu_list = test_image._get_hdu_list()
+    assert np.shares_memory(hdu_list['SCI'].data, test_image.data)
+    assert np.shares_memory(hdu_list['BPM'].data, test_image.bpm)
+
+    filename = str(tmpdir.join('test.fits'))
+    hdu_list.writeto(filename)
+    with fits.open(filename) as written_hdu_list:
+        np.testing.assert_array_equal(written_hdu_list['SCI'].data, test_image.data)
+        assert written_hdu_list['SCI'].header['OBSTYPE'] == 'BIAS'
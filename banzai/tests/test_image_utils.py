@@ -1,7 +1,8 @@
+import mock
 import pytest
 
 from banzai.utils import image_utils
-from banzai.tests.utils import FakeImage
+from banzai.tests.utils import FakeImage, FakeContext, FakeInstrument
 
 
 def throws_inhomogeneous_set_exception(image1, image2,  keyword, additional_group_by_attributes=None):
@@ -32,3 +33,35 @@ def test_raises_exception_if_ccdsums_are_different():
 
 def test_raises_exception_if_filters_are_different():
     throws_inhomogeneous_set_exception(FakeImage(filter='w'), FakeImage(filter='V'), 'filter', ['filter'])
+
+
+def test_make_image_path_list_prefers_uncompressed_files(tmpdir):
+    for filename in ['frame1.fits', 'frame1.fits.fz', 'frame2.fits.fz', 'frame3.fits', 'notes.txt', '.hidden.fits']:
+        tmpdir.join(filename).write('')
+    image_path_list = image_utils.make_image_path_list(str(tmpdir))
+    expected_filenames = ['frame1.fits', 'frame2.fits.fz', 'frame3.fits']
+    assert sorted(image_path_list) == [str(tmpdir.join(filename)) for filename in expected_filenames]
+
+
+@mock.patch('banzai.utils.image_utils.dbs.get_instrument')
+@mock.patch('banzai.utils.image_utils.image_can_be_processed')
+@mock.patch('banzai.utils.image_utils.get_primary_header')
+def test_select_images_filters_obstype_before_querying_database(mock_header, mock_can_process, mock_instrument):
+    headers = {'bias.fits': {'OBSTYPE': 'BIAS'}, 'dark.fits': {'OBSTYPE': 'DARK'}}
+    mock_header.side_effect = lambda filename: headers[filename]
+    mock_can_process.return_value = True
+    mock_instrument.return_value = FakeInstrument(schedulable=True)
+    context = FakeContext()
+    context.ignore_schedulability = False
+    assert image_utils.select_images(['bias.fits', 'dark.fits'], 'BIAS', context) == ['bias.fits']
+    mock_can_process.assert_called_once_with(headers['bias.fits'], context)
+    mock_instrument.assert_called_once_with(headers['bias.fits'], db_address=context.db_address)
+
+
+@mock.patch('banzai.utils.image_utils.import_utils.import_attribute')
+def test_get_frame_class_only_imports_once(mock_import):
+    image_utils.get_frame_class.cache_clear()
+    image_utils.get_frame_class('banzai.tests.utils.FakeImage')
+    image_utils.get_frame_class('banzai.tests.utils.FakeImage')
+    mock_import.assert_called_once_with('banzai.tests.utils.FakeImage')
+    image_utils.get_frame_class.cache_clear()
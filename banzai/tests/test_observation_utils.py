@@ -94,3 +94,16 @@ def test_filter_calibration_blocks_for_type_ignore_empty_observations():
     fake_inst = FakeInstrument(site='cpt', camera='fa06', enclosure='domc', telescope='2m0a', type='1m0-SciCam-Sinistro')
     filtered_blocks = observation_utils.filter_calibration_blocks_for_type(fake_inst, 'SKYFLAT', fake_response_json['results'])
     assert len(filtered_blocks) == 0
+
+
+def test_get_expected_image_count():
+    observations = [{'request': {'configurations': [{'type': 'BIAS',
+                                                     'instrument_configs': [{'exposure_count': 2},
+                                                                            {'exposure_count': 3}]},
+                                                    {'type': 'DARK',
+                                                     'instrument_configs': [{'exposure_count': 7}]}]}},
+                    {'request': {'configurations': [{'type': 'BIAS',
+                                                     'instrument_configs': [{'exposure_count': 5}]}]}}]
+    assert observation_utils.get_expected_image_count(observations, 'bias') == 10
+    assert observation_utils.get_expected_image_count(observations, 'DARK') == 7
+    assert observation_utils.get_expected_image_count(observations, 'SKYFLAT') == 0
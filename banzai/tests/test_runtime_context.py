@@ -9,3 +9,11 @@ def test_context_gets_arguments_from_argparse():
     assert context.a == 1
     assert context.b == 2
     assert context.c == 5
+
+
+def test_context_from_dict_does_not_share_the_dict():
+    args = {'a': 1}
+    context = Context(args)
+    args['a'] = 2
+    assert context.a == 1
+    assert vars(context) == {'a': 1}
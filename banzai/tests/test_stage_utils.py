@@ -0,0 +1,14 @@
+from banzai.utils import stage_utils
+from banzai.bias import BiasMasterLevelSubtractor, BiasComparer
+from banzai.trim import Trimmer
+from banzai.bpm import BPMUpdater
+
+
+def test_get_stages_for_obstype():
+    stages = stage_utils.get_stages_for_obstype('BIAS')
+    assert stages[0] is BPMUpdater
+    assert stages[-3:] == (Trimmer, BiasMasterLevelSubtractor, BiasComparer)
+
+
+def test_get_stages_for_obstype_is_only_resolved_once():
+    assert stage_utils.get_stages_for_obstype('DARK') is stage_utils.get_stages_for_obstype('DARK')
@@ -671,6 +671,50 @@ def test_mad_3d_axis_2_mask(set_random_seed):
         np.testing.assert_allclose(actual, expected.astype(np.float32), atol=1e-9)
 
 
+def test_nan_sigma_clipped_mean_3d_axis_2(set_random_seed):
+    for i in range(5):
+        size1 = np.random.randint(1, 50)
+        size2 = np.random.randint(1, 50)
+        size3 = np.random.randint(5, 50)
+        mean = np.random.uniform(-1000, 1000)
+        sigma = np.random.uniform(0, 1000)
+        a = np.random.normal(mean, sigma, size=(size1, size2, size3)).astype(np.float32)
+        value_to_mask = np.random.uniform(0, 0.8)
+        mask = np.random.uniform(0, 1.0, size=(size1, size2, size3)) < value_to_mask
+        expected = stats.sigma_clipped_mean(a, 3.0, axis=2, mask=mask)
+        a[mask] = np.nan
+        actual = stats.nan_sigma_clipped_mean(a, 3.0, axis=2)
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-2)
+
+
+def test_nan_sigma_clipped_mean_2d_axis_0(set_random_seed):
+    for i in range(5):
+        size1 = np.random.randint(5, 300)
+        size2 = np.random.randint(1, 300)
+        mean = np.random.uniform(-1000, 1000)
+        sigma = np.random.uniform(0, 1000)
+        a = np.random.normal(mean, sigma, size=(size1, size2)).astype(np.float32)
+        value_to_mask = np.random.uniform(0, 0.8)
+        mask = np.random.uniform(0, 1.0, size=(size1, size2)) < value_to_mask
+        expected = stats.sigma_clipped_mean(a, 3.0, axis=0, mask=mask)
+        a[mask] = np.nan
+        actual = stats.nan_sigma_clipped_mean(a, 3.0, axis=0)
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-2)
+
+
+def test_nan_sigma_clipped_mean_axis_none_rejects_outliers():
+    a = np.ones(100, dtype=np.float32)
+    a[:10] = 1000.0
+    a[10:20] = np.nan
+    assert stats.nan_sigma_clipped_mean(a, 3.0) == 1.0
+
+
+def test_nan_sigma_clipped_mean_all_masked_returns_fill_value():
+    a = np.full((3, 4, 5), np.nan, dtype=np.float32)
+    np.testing.assert_array_equal(stats.nan_sigma_clipped_mean(a, 3.0, axis=2, fill_value=-1.0),
+                                  -np.ones((3, 4), dtype=np.float32))
+
+
 # def test_rstd_axis_none_mask_none():
 #     for i in range(1000):
 #         size = np.random.randint(1, 10000)
@@ -73,6 +73,7 @@ class FakeContext(object):
         self.db_address = 'sqlite:foo'
         self.ignore_schedulability = False
         self.max_tries = 5
+        self.n_stack_workers = None
 
     def image_can_be_processed(self, header):
         return True
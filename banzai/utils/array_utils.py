@@ -3,11 +3,17 @@ import numpy as np
 
 
 def array_indices_to_slices(a):
-    return tuple(slice(0, x, 1) for x in a.shape)
+    # slice(x) is the same as slice(0, x, 1) when indexing. The stops are needed (rather than just using
+    # Ellipsis) so that a larger array indexed with these slices is cropped to the shape of a.
+    return tuple(map(slice, a.shape))
 
 
 def prune_nans_from_table(table):
     nan_in_row = np.zeros(len(table), dtype=bool)
-    for col in table.colnames:
-        nan_in_row |= np.isnan(table[col])
+    is_nan = np.empty(len(table), dtype=bool)
+    for col in table.itercols():
+        # Only floating point columns can hold NaNs (and np.isnan fails on string columns)
+        if np.issubdtype(col.dtype, np.floating):
+            np.isnan(col, out=is_nan)
+            nan_in_row |= is_nan
     return table[~nan_in_row]
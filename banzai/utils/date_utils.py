@@ -98,6 +98,21 @@ def parse_date_obs(date_obs_string):
     return datetime.datetime.strptime(date_obs_string, '%Y-%m-%dT%H:%M:%S.%f')
 
 
+def parse_iso_date(date_string):
+    """
+    Parse an ISO 8601 timestamp, e.g. "2019-06-10T10:50:00Z"
+
+    Notes
+    -----
+    This uses datetime.fromisoformat, which is much faster than the general dateutil parser. We
+    fall back to dateutil for strings that fromisoformat does not understand.
+    """
+    try:
+        return datetime.datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+    except ValueError:
+        return parse(date_string)
+
+
 def date_obs_to_string(date_obs):
     return date_obs.strftime('%Y-%m-%dT%H:%M:%S.%f')
 
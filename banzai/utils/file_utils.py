@@ -2,18 +2,21 @@ import hashlib
 import os
 import logging
 
-from kombu import Connection, Exchange
+from kombu import Connection, Exchange, pools
 from banzai.utils import import_utils
 
 logger = logging.getLogger('banzai')
 
+ARCHIVE_QUEUE_RETRY_POLICY = {'max_retries': 3, 'interval_start': 0, 'interval_step': 1, 'interval_max': 5}
+
 
 def post_to_archive_queue(image_path, broker_url, exchange_name='fits_files'):
     exchange = Exchange(exchange_name, type='fanout')
-    with Connection(broker_url) as conn:
-        producer = conn.Producer(exchange=exchange)
-        producer.publish({'path': image_path})
-        producer.release()
+    # Reuse the connection to the broker between files instead of doing a new handshake for every frame
+    with pools.producers[Connection(broker_url)].acquire(block=True) as producer:
+        # Only retry a few times so that a broker outage raises (and gets logged) instead of hanging the write
+        producer.publish({'path': image_path}, exchange=exchange, declare=[exchange], retry=True,
+                         retry_policy=ARCHIVE_QUEUE_RETRY_POLICY)
 
 
 def make_output_directory(runtime_context, image_config):
@@ -26,25 +29,25 @@ def make_output_directory(runtime_context, image_config):
     else:
         output_directory = os.path.join(output_directory, 'processed')
 
-    if not os.path.exists(output_directory):
-        os.makedirs(output_directory)
+    os.makedirs(output_directory, exist_ok=True)
 
     return output_directory
 
 
-def get_md5(filepath):
+def get_md5(filepath, chunk_size=1024 * 1024):
+    md5 = hashlib.md5()
+    # Hash the file in chunks so we never hold a whole frame in memory
     with open(filepath, 'rb') as file:
-        md5 = hashlib.md5(file.read()).hexdigest()
-    return md5
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+INSTANTLY_PUBLIC_PROPOSALS = frozenset(['calibrate', 'standard', 'pointing'])
 
 
 def instantly_public(proposal_id):
-    public_now = False
-    if proposal_id in ['calibrate', 'standard', 'pointing']:
-        public_now = True
-    if 'epo' in proposal_id.lower():
-        public_now = True
-    return public_now
+    return proposal_id in INSTANTLY_PUBLIC_PROPOSALS or 'epo' in proposal_id.lower()
 
 
 def ccdsum_to_filename(image):
@@ -1,7 +1,6 @@
 import os
 import tempfile
 import logging
-import copy
 
 from banzai import logs
 
@@ -27,14 +26,13 @@ def sanitizeheader(header):
 
 
 def split_slice(pixel_section):
-    pixels = pixel_section.split(':')
-    if int(pixels[1]) > int(pixels[0]):
-        pixel_slice = slice(int(pixels[0]) - 1, int(pixels[1]), 1)
+    start, stop = (int(pixel) for pixel in pixel_section.split(':'))
+    if stop > start:
+        pixel_slice = slice(start - 1, stop, 1)
+    elif stop == 1:
+        pixel_slice = slice(start - 1, None, -1)
     else:
-        if int(pixels[1]) == 1:
-            pixel_slice = slice(int(pixels[0]) - 1, None, -1)
-        else:
-            pixel_slice = slice(int(pixels[0]) - 1, int(pixels[1]) - 2, -1)
+        pixel_slice = slice(start - 1, stop - 2, -1)
     return pixel_slice
 
 
@@ -119,30 +117,74 @@ def open_fits_file(filename):
     -----
     This is a wrapper to astropy.io.fits.open but funpacks the file first.
     """
-    base_filename, file_extension = os.path.splitext(os.path.basename(filename))
-    if file_extension == '.fz':
+    if is_fpacked(filename):
         with tempfile.TemporaryDirectory() as tmpdirname:
-            output_filename = os.path.join(tmpdirname, base_filename)
-            os.system('funpack -O {0} {1}'.format(output_filename, filename))
-            hdulist = fits.open(output_filename, 'readonly')
-            hdulist_copy = copy.deepcopy(hdulist)
-            hdulist.close()
+            hdulist = _read_fits_file(funpack(filename, tmpdirname))
     else:
-        hdulist = fits.open(filename, 'readonly')
-        hdulist_copy = copy.deepcopy(hdulist)
-        hdulist.close()
-    return hdulist_copy
+        hdulist = _read_fits_file(filename)
+    return hdulist
+
+
+def is_fpacked(filename):
+    return os.path.splitext(filename)[1] == '.fz'
+
+
+def funpack(filename, output_directory):
+    """
+    Uncompress an fpacked file
+
+    Parameters
+    ----------
+    filename: str
+              Full path of the fpacked file
+    output_directory: str
+                      Directory to write the uncompressed file into
+
+    Returns
+    -------
+    output_filename: str
+                     Full path to the uncompressed file
+    """
+    output_filename = os.path.join(output_directory, os.path.splitext(os.path.basename(filename))[0])
+    os.system('funpack -O {0} {1}'.format(output_filename, filename))
+    return output_filename
+
+
+def _read_fits_file(filename):
+    # Read each extension straight into memory so the file can be closed (and removed) without having to
+    # deep copy every array in the HDU list
+    # Be explicit that we don't want an extra pass over the pixels to verify CHECKSUM/DATASUM
+    with fits.open(filename, 'readonly', memmap=False, checksum=False) as hdulist:
+        for hdu in hdulist:
+            hdu.data
+    return hdulist
 
 
 def get_primary_header(filename):
     try:
-        hdulist = open_fits_file(filename)
-        return hdulist[0].header
+        # Only read the header blocks rather than loading (or decompressing) the pixel data
+        if is_fpacked(filename):
+            return _get_fpacked_primary_header(filename)
+        return fits.getheader(filename, ext=0)
     except Exception:
         logger.error("Unable to open fits file: {}".format(logs.format_exception()), extra_tags={'filename': filename})
         return None
 
 
+def _get_fpacked_primary_header(filename):
+    with fits.open(filename, 'readonly') as hdulist:
+        header = hdulist[0].header
+        try:
+            compressed_hdu = hdulist[1]
+        except IndexError:
+            return header
+        # fpack moves a primary image into the first extension and marks it with ZSIMPLE, which astropy shows as
+        # SIMPLE in the uncompressed header. funpack would put that header back as the primary one.
+        if isinstance(compressed_hdu, fits.CompImageHDU) and compressed_hdu.header.get('SIMPLE', False):
+            header = compressed_hdu.header
+    return header
+
+
 def open_image(filename):
     """
     Load an image from a FITS file
@@ -1,6 +1,7 @@
 import os
 from glob import glob
 import logging
+from functools import lru_cache
 
 from banzai import logs
 from banzai import dbs
@@ -30,9 +31,11 @@ def select_images(image_list, image_type, context):
     for filename in image_list:
         try:
             header = get_primary_header(filename)
+            # Filter on the OBSTYPE from the header we already have before making any database queries
+            if header is not None and image_type is not None and get_obstype(header) != image_type:
+                continue
             should_process = image_can_be_processed(header, context)
-            should_process &= (image_type is None or get_obstype(header) == image_type)
-            if not context.ignore_schedulability:
+            if should_process and not context.ignore_schedulability:
                 instrument = dbs.get_instrument(header, db_address=context.db_address)
                 should_process &= instrument.schedulable
             if should_process:
@@ -44,17 +47,15 @@ def select_images(image_list, image_type, context):
 
 def make_image_path_list(raw_path):
     if os.path.isdir(raw_path):
-        # return the list of file and a dummy image configuration
-        fits_files = glob(os.path.join(raw_path, '*.fits'))
-        fz_files = glob(os.path.join(raw_path, '*.fits.fz'))
-
-        fz_files_to_remove = []
-        for i, f in enumerate(fz_files):
-            if f[:-3] in fits_files:
-                fz_files_to_remove.append(f)
-
-        for f in fz_files_to_remove:
-            fz_files.remove(f)
+        # Scan the directory once for both uncompressed and fpacked files (skipping hidden files like glob does)
+        with os.scandir(raw_path) as entries:
+            image_paths = [entry.path for entry in entries
+                           if entry.name.endswith(('.fits', '.fits.fz')) and not entry.name.startswith('.')]
+        fits_files = [f for f in image_paths if f.endswith('.fits')]
+
+        # Prefer the uncompressed file if we have both versions of a frame
+        fits_file_set = set(fits_files)
+        fz_files = [f for f in image_paths if f.endswith('.fits.fz') and f[:-3] not in fits_file_set]
         image_path_list = fits_files + fz_files
 
     else:
@@ -93,9 +94,15 @@ def image_can_be_processed(header, context):
     return passes
 
 
+@lru_cache(maxsize=None)
+def get_frame_class(frame_class_name):
+    # Only import the frame class once rather than for every frame that we read
+    return import_utils.import_attribute(frame_class_name)
+
+
 def read_image(filename, runtime_context):
     try:
-        frame_class = import_utils.import_attribute(runtime_context.FRAME_CLASS)
+        frame_class = get_frame_class(runtime_context.FRAME_CLASS)
         image = frame_class(runtime_context, filename=filename)
         if image.instrument is None:
             logger.error("Image instrument attribute is None, aborting", image=image)
@@ -3,6 +3,7 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 from libc.stdint cimport uint8_t
 from libc.stdlib cimport malloc, free
+from libc.math cimport fabs
 import numpy as np
 cimport numpy as np
 
@@ -14,6 +15,22 @@ np.import_array()
 cdef extern from "quick_select.h":
     float quick_select(float * k, int k, int n) nogil
 
+# OpenMP is optional when building, so only ask it for the default number of threads if it is available
+cdef extern from *:
+    """
+    #ifdef _OPENMP
+    #include <omp.h>
+    #endif
+    static int banzai_max_threads(void) {
+    #ifdef _OPENMP
+        return omp_get_max_threads();
+    #else
+        return 1;
+    #endif
+    }
+    """
+    int banzai_max_threads() nogil
+
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -105,3 +122,91 @@ def median2d(float[:, ::1] d, uint8_t[:, ::1] mask):
             output_array[j] = _cmedian1d(median_array, n_unmasked_pixels)
         free(median_array)
     return output_array
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef float _csigma_clipped_mean1d(float* values, int n, float* good_pixels, float* abs_deviation,
+                                  float sigma, float fill_value) nogil:
+    cdef int i
+    cdef int n_good_pixels = 0
+    cdef int n_kept_pixels = 0
+    cdef float med
+    cdef float threshold
+    cdef double total = 0.0
+
+    for i in range(n):
+        # NaN is the only value that is not equal to itself
+        if values[i] == values[i]:
+            good_pixels[n_good_pixels] = values[i]
+            n_good_pixels += 1
+
+    if n_good_pixels == 0:
+        return fill_value
+
+    # The quick select reorders good_pixels in place, but it still holds the same set of values
+    med = _cmedian1d(good_pixels, n_good_pixels)
+    for i in range(n_good_pixels):
+        abs_deviation[i] = fabs(good_pixels[i] - med)
+    threshold = sigma * 1.4826 * _cmedian1d(abs_deviation, n_good_pixels)
+
+    for i in range(n_good_pixels):
+        if fabs(good_pixels[i] - med) <= threshold:
+            total += good_pixels[i]
+            n_kept_pixels += 1
+
+    if n_kept_pixels == 0:
+        return fill_value
+    return total / n_kept_pixels
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def sigma_clipped_mean2d(float[:, ::1] d not None, float sigma, float fill_value=0.0, int n_threads=0):
+    """sigma_clipped_mean2d(d, sigma, fill_value=0.0, n_threads=0)\n
+    Find the sigma clipped mean of each row of a 2d array. NaNs are treated as masked values.
+    Parameters
+    ----------
+    d : float numpy array
+        Input array with shape (number of pixels, number of samples).
+    sigma : float
+            Number of robust standard deviations from the median beyond which values are rejected.
+    fill_value : float
+                 Value to return for rows where every element is masked.
+    n_threads : int
+                Number of OpenMP threads to use. Values less than 1 use the OpenMP default.
+    Returns
+    -------
+    mean : float numpy array
+        The sigma clipped mean of each row.
+    Notes
+    -----
+    The robust standard deviation is 1.4826 times the median absolute deviation from the median.
+    Each row is processed independently with its own scratch buffers, so the rows are
+    split evenly across threads when OpenMP is available. This avoids the temporary arrays needed
+    by the masked array implementation in banzai.utils.stats.sigma_clipped_mean.
+    """
+    cdef int nx = d.shape[1]
+    cdef int ny = d.shape[0]
+
+    cdef int j = 0
+
+    cdef float[::1] output_array = np.empty(ny, dtype=np.float32)
+    cdef float* good_pixels
+    cdef float* abs_deviation
+
+    if ny == 0:
+        return np.asarray(output_array)
+
+    if n_threads < 1:
+        n_threads = banzai_max_threads()
+
+    with nogil, parallel(num_threads=n_threads):
+        good_pixels = <float *> malloc(nx * sizeof(float))
+        abs_deviation = <float *> malloc(nx * sizeof(float))
+        for j in prange(ny, schedule='static'):
+            output_array[j] = _csigma_clipped_mean1d(&d[j, 0], nx, good_pixels, abs_deviation,
+                                                     sigma, fill_value)
+        free(good_pixels)
+        free(abs_deviation)
+    return np.asarray(output_array)
@@ -31,3 +31,13 @@ def filter_calibration_blocks_for_type(instrument, calibration_type, observation
             if len(filtered_observation['request']['configurations']) != 0:
                 calibration_observations.append(filtered_observation)
     return calibration_observations
+
+
+def get_expected_image_count(observations, calibration_type):
+    expected_image_count = 0
+    for observation in observations:
+        for configuration in observation['request']['configurations']:
+            if calibration_type.upper() == configuration['type']:
+                for instrument_config in configuration['instrument_configs']:
+                    expected_image_count += instrument_config['exposure_count']
+    return expected_image_count
@@ -70,7 +70,10 @@ def get_extensions():
                         include_dirs=include_dirs,
                         libraries=libraries,
                         language="c",
-                        extra_compile_args=['-g', '-O3', '-funroll-loops', '-ffast-math'])
+                        # Masked values are passed to the sigma clipping as NaNs, so we need to keep
+                        # NaN comparisons intact even though we otherwise use fast math
+                        extra_compile_args=['-g', '-O3', '-funroll-loops', '-ffast-math',
+                                            '-fno-finite-math-only'])
 
     has_openmp, outputs = check_openmp()
     if has_openmp:
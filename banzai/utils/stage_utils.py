@@ -1,5 +1,6 @@
 from banzai import settings
 from banzai.utils import import_utils, image_utils
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger('banzai')
@@ -43,6 +44,30 @@ def get_stages_todo(ordered_stages, last_stage=None, extra_stages=None):
     return stages_todo
 
 
+@lru_cache(maxsize=None)
+def get_stages_for_obstype(obstype):
+    """
+    Get the stages to run for a given observation type
+
+    Parameters
+    ----------
+    obstype: str
+             Observation type of the image, e.g. BIAS
+
+    Returns
+    -------
+    stages_todo: tuple of banzai.stages.Stage
+                 The stages that need to be done
+
+    Notes
+    -----
+    The stage classes only depend on the settings, so they are resolved once per observation type
+    and reused for every subsequent frame rather than being imported again for each image.
+    """
+    return tuple(get_stages_todo(settings.ORDERED_STAGES, last_stage=settings.LAST_STAGE[obstype],
+                                 extra_stages=settings.EXTRA_STAGES[obstype]))
+
+
 def run(image_path, runtime_context):
     """
     Main driver script for banzai.
@@ -50,9 +75,7 @@ def run(image_path, runtime_context):
     image = image_utils.read_image(image_path, runtime_context)
     if image is None:
         return
-    stages_to_do = get_stages_todo(settings.ORDERED_STAGES,
-                                   last_stage=settings.LAST_STAGE[image.obstype],
-                                   extra_stages=settings.EXTRA_STAGES[image.obstype])
+    stages_to_do = get_stages_for_obstype(image.obstype)
     logger.info("Starting to reduce frame", image=image)
     for stage in stages_to_do:
         stage_to_run = stage(runtime_context)
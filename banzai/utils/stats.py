@@ -140,3 +140,50 @@ def sigma_clipped_mean(a, sigma, axis=None, mask=None, fill_value=0.0, inplace=F
         mean_values[n_good_pixels == 0] = fill_value
 
     return mean_values
+
+
+def nan_sigma_clipped_mean(a, sigma, axis=None, fill_value=0.0, n_threads=None):
+    """
+    Find the sigma clipped mean of a numpy array where masked values have been set to NaN.
+    If an axis is provided, then find the sigma clipped mean along the given axis.
+
+    Parameters
+    ----------
+    a : float32 numpy array
+        Input array. Elements that are NaN are ignored.
+    sigma : float
+            Values more than sigma robust standard deviations from the median are rejected.
+    axis : int (default is None)
+           Index of the array to take the sigma clipped mean
+    fill_value : float (default is 0.0)
+                 Value returned where all of the elements are masked or rejected.
+    n_threads : int (default is None)
+                Number of threads to split the calculation over. If None, use the OpenMP default.
+
+    Returns
+    -------
+    mean_values : float32 numpy array
+        The sigma clipped mean. If axis is None, then we return a single float.
+
+    Notes
+    -----
+    This produces the same result as sigma_clipped_mean with a mask, but each output value is
+    calculated in a single pass of the Cython kernel in median_utils rather than building
+    several temporary arrays the size of the input. Reducing along the last axis of a C contiguous
+    array avoids making a copy of the input.
+    """
+    if axis is None:
+        output_shape = None
+        a = a.reshape(1, -1)
+    else:
+        output_shape = np.delete(a.shape, axis)
+        a = np.moveaxis(a, axis, -1)
+        a = a.reshape(-1, a.shape[-1])
+
+    if n_threads is None:
+        n_threads = 0
+    mean_values = median_utils.sigma_clipped_mean2d(np.ascontiguousarray(a, dtype=np.float32), sigma,
+                                                    fill_value=fill_value, n_threads=n_threads)
+    if axis is None:
+        return mean_values[0]
+    return mean_values.reshape(output_shape)